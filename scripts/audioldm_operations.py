@@ -1,18 +1,199 @@
 #!/usr/bin/env python
-import argparse
 import json
 import sys
 import os
 import base64
+import queue
+import threading
 import time
 import torch
 import numpy as np
 from transformers import T5EncoderModel
 from audioldm import AudioLDM
 import soundfile as sf
-from io import BytesIO
+from contextlib import nullcontext
 
-def load_model(model_path, quantization='8bit', use_half_precision=True):
+# TF32 matmul and autotuned cuDNN conv algorithms: large FP32 matmul
+# speedups on Ampere+ at negligible accuracy cost, and benchmark mode
+# picks the best conv kernels for the stable shapes a request stream
+# produces under the persistent server
+if torch.cuda.is_available():
+    torch.backends.cuda.matmul.allow_tf32 = True
+    torch.backends.cudnn.allow_tf32 = True
+    torch.backends.cudnn.benchmark = True
+    torch.set_float32_matmul_precision('high')
+
+# orjson parses and serializes 2-3x faster than the stdlib json; fall
+# back transparently when it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def json_loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def json_dumps(obj):
+    if orjson is not None:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj)
+
+def parse_args(argv):
+    """Minimal --flag value parser; argparse construction is ~5 ms of
+    overhead per fork, which matters for one-shot CLI invocations"""
+    args = {}
+    i = 0
+    while i < len(argv) - 1:
+        if argv[i].startswith('--'):
+            args[argv[i][2:]] = argv[i + 1]
+            i += 2
+        else:
+            i += 1
+    return args
+
+# Transformer Engine is optional; it is only needed for the fp8 path on
+# Hopper-class GPUs
+try:
+    import transformer_engine.pytorch as te
+    from transformer_engine.common import recipe as te_recipe
+except ImportError:
+    te = None
+    te_recipe = None
+
+# Module-level model state so a persistent server only loads once
+MODEL = None
+MODEL_KEY = None
+
+# Set when the resident model has been converted to FP8 layers
+FP8_ENABLED = False
+
+# Micro-batching limits for queued generate requests in server mode
+MAX_BATCH = 8
+BATCH_WINDOW = 0.02  # seconds
+
+# Cached text-encoder outputs keyed by prompt; repeated prompts (UI
+# retries, A/B sampling) skip the T5 forward entirely
+TEXT_EMBEDDING_CACHE = {}
+TEXT_EMBEDDING_CACHE_MAX = 256
+
+def get_text_embedding(model, prompt):
+    """Return the cached text embedding for a prompt, encoding on a miss
+
+    Returns None when the model does not expose its text encoder, in
+    which case generate falls back to encoding the prompt internally.
+    """
+    if not hasattr(model, 'get_text_embedding'):
+        return None
+    if prompt not in TEXT_EMBEDDING_CACHE:
+        if len(TEXT_EMBEDDING_CACHE) >= TEXT_EMBEDDING_CACHE_MAX:
+            # Evict the oldest entry (dicts preserve insertion order)
+            TEXT_EMBEDDING_CACHE.pop(next(iter(TEXT_EMBEDDING_CACHE)))
+        TEXT_EMBEDDING_CACHE[prompt] = model.get_text_embedding(prompt)
+    return TEXT_EMBEDDING_CACHE[prompt]
+
+# Cached scheduler timetables keyed by step count so repeated requests
+# skip recomputing sigmas/timesteps at the start of sampling
+SCHEDULE_CACHE = {}
+SCHEDULE_CACHE_MAX = 16
+
+def install_schedule_cache(model):
+    """Wrap scheduler.set_timesteps with a per-step-count cache
+
+    The scheduler recomputes timesteps/sigmas on every set_timesteps
+    call, and generate calls it internally on every request — so the
+    wrapper has to sit on the scheduler itself for that call to become
+    the cache hit. The timetable for a step count is computed once and
+    afterwards restored from cached copies, which is redundant CPU work
+    saved per request and keeps the schedule tensors stable across
+    calls. No-op when the model does not expose its scheduler.
+    """
+    scheduler = getattr(model, 'scheduler', None)
+    if scheduler is None or not hasattr(scheduler, 'set_timesteps'):
+        return
+    if getattr(scheduler, '_set_timesteps_cached', False):
+        return
+
+    original = scheduler.set_timesteps
+
+    def cached_set_timesteps(num_inference_steps, *args, **kwargs):
+        # Only the plain signature is cacheable; extra arguments (e.g. a
+        # device override) pass straight through
+        if args or kwargs:
+            return original(num_inference_steps, *args, **kwargs)
+
+        cached = SCHEDULE_CACHE.get(num_inference_steps)
+        if cached is None:
+            original(num_inference_steps)
+            cached = {}
+            for name in ('timesteps', 'sigmas', 'num_inference_steps'):
+                if hasattr(scheduler, name):
+                    value = getattr(scheduler, name)
+                    cached[name] = value.clone() if torch.is_tensor(value) else value
+            if len(SCHEDULE_CACHE) >= SCHEDULE_CACHE_MAX:
+                # Evict the oldest entry (dicts preserve insertion order)
+                SCHEDULE_CACHE.pop(next(iter(SCHEDULE_CACHE)))
+            SCHEDULE_CACHE[num_inference_steps] = cached
+        else:
+            # Restore clones: scheduler.step can mutate these in place
+            for name, value in cached.items():
+                setattr(
+                    scheduler,
+                    name,
+                    value.clone() if torch.is_tensor(value) else value
+                )
+
+    scheduler.set_timesteps = cached_set_timesteps
+    scheduler._set_timesteps_cached = True
+
+def fp8_supported():
+    """Check for Transformer Engine and a Hopper-class (SM 9.0+) GPU"""
+    return (
+        te is not None
+        and torch.cuda.is_available()
+        and torch.cuda.get_device_capability() >= (9, 0)
+    )
+
+def convert_linear_to_fp8(module):
+    """Recursively replace nn.Linear layers with Transformer Engine equivalents
+
+    Weights are copied over so the converted module is numerically
+    equivalent outside of fp8_autocast regions.
+    """
+    import torch.nn as nn
+
+    for name, child in module.named_children():
+        if isinstance(child, nn.Linear):
+            fp8_linear = te.Linear(
+                child.in_features,
+                child.out_features,
+                bias=child.bias is not None
+            )
+            with torch.no_grad():
+                fp8_linear.weight.copy_(child.weight)
+                if child.bias is not None:
+                    fp8_linear.bias.copy_(child.bias)
+            setattr(module, name, fp8_linear)
+        else:
+            convert_linear_to_fp8(child)
+
+def fp8_context():
+    """Context manager wrapping generation in FP8 autocast when enabled
+
+    Uses delayed scaling with a hybrid E4M3/E5M2 format, which tracks
+    per-tensor amax history instead of naively casting to float8.
+    """
+    if FP8_ENABLED and te is not None:
+        fp8_recipe = te_recipe.DelayedScaling(
+            margin=0,
+            interval=1,
+            fp8_format=te_recipe.Format.HYBRID
+        )
+        return te.fp8_autocast(enabled=True, fp8_recipe=fp8_recipe)
+    return nullcontext()
+
+def load_model(model_path, quantization='nf4', use_half_precision=True):
     """Load AudioLDM model with memory optimizations"""
     try:
         # Configure quantization
@@ -23,7 +204,21 @@ def load_model(model_path, quantization='8bit', use_half_precision=True):
         elif quantization == '4bit':
             from transformers import BitsAndBytesConfig
             quantization_config = BitsAndBytesConfig(load_in_4bit=True)
-        
+        elif quantization == 'nf4':
+            # NF4 weight quantization with BF16 compute: ~half the weight
+            # footprint of INT8 while preserving generation quality
+            from transformers import BitsAndBytesConfig
+            quantization_config = BitsAndBytesConfig(
+                load_in_4bit=True,
+                bnb_4bit_quant_type='nf4',
+                bnb_4bit_compute_dtype=torch.bfloat16,
+                bnb_4bit_use_double_quant=True
+            )
+        elif quantization == 'fp8' and not fp8_supported():
+            raise RuntimeError(
+                "fp8 quantization requires transformer_engine and a Hopper-class GPU"
+            )
+
         # Initialize model with optimizations
         device = "cuda" if torch.cuda.is_available() else "cpu"
         
@@ -34,79 +229,182 @@ def load_model(model_path, quantization='8bit', use_half_precision=True):
             quantization_config=quantization_config
         )
         
-        # Apply half precision if requested and not using quantization
-        if use_half_precision and quantization == 'none' and device == 'cuda':
-            model = model.half()
-        
-        # Apply gradient checkpointing to reduce memory usage
-        if hasattr(model, 'enable_gradient_checkpointing'):
-            model.enable_gradient_checkpointing()
-        
+        # Note: no blanket .half() here even when use_half_precision is
+        # set; BF16 autocast around generate handles per-op precision,
+        # which avoids FP16 issues in Conv/LayerNorm layers
+
+        # Inference-only setup: gradient checkpointing is deliberately
+        # not enabled — it trades compute for memory during backward, and
+        # with no backward pass here it only forces recomputation and
+        # disables fused-attention fastpaths. Freezing the parameters
+        # lets PyTorch skip autograd bookkeeping everywhere.
+        if hasattr(model, 'eval'):
+            model.eval()
+        if hasattr(model, 'requires_grad_'):
+            model.requires_grad_(False)
+        if hasattr(model, 'config') and hasattr(model.config, 'use_cache'):
+            model.config.use_cache = True
+
+        # Convert U-Net linear layers to FP8 on Hopper so the diffusion
+        # GEMMs hit the FP8 tensor cores (generate wraps in fp8_autocast)
+        global FP8_ENABLED
+        FP8_ENABLED = False
+        if quantization == 'fp8' and hasattr(model, 'unet'):
+            convert_linear_to_fp8(model.unet)
+            FP8_ENABLED = True
+
+        # Cache scheduler timetables so repeated step counts skip the
+        # set_timesteps recompute that generate triggers on every call
+        install_schedule_cache(model)
+
+        # Compile the U-Net so each diffusion step skips Python->ATen
+        # dispatch overhead; shapes are static for a given request stream
+        if hasattr(torch, 'compile') and hasattr(model, 'unet'):
+            model.unet = torch.compile(
+                model.unet,
+                mode='reduce-overhead',
+                fullgraph=False,
+                dynamic=False
+            )
+
         return model
-        
+
     except Exception as e:
-        print(json.dumps({"error": str(e)}))
-        sys.exit(1)
+        # Let callers decide how to report the failure; in server mode a
+        # failed load must not take the whole process down
+        raise RuntimeError(f"Failed to load model: {e}")
 
-def generate_audio(model, prompt, 
+def get_model(model_path, quantization='nf4', use_half_precision=True):
+    """Return the resident model, loading it on first use or config change"""
+    global MODEL, MODEL_KEY
+    key = (model_path, quantization, use_half_precision)
+    if MODEL is None or MODEL_KEY != key:
+        # Embeddings and scheduler timetables belong to the outgoing
+        # model instance; carrying them over would feed stale tensors
+        # into the replacement
+        TEXT_EMBEDDING_CACHE.clear()
+        SCHEDULE_CACHE.clear()
+        MODEL = load_model(model_path, quantization, use_half_precision)
+        MODEL_KEY = key
+    return MODEL
+
+def to_pcm16(waveform):
+    """Convert a waveform to int16 PCM before it reaches libsndfile
+
+    The vectorized scale+clip+cast runs on the GPU when the waveform is
+    still a CUDA tensor, so sf.write only streams raw int16 bytes instead
+    of doing a per-sample float conversion on the Python thread.
+    """
+    if torch.is_tensor(waveform):
+        pcm = (waveform.detach().float().clamp(-1, 1) * 32767).to(torch.int16)
+        return pcm.cpu().numpy()
+    return (np.clip(waveform, -1, 1) * 32767).astype(np.int16)
+
+def generate_audio(model, prompt,
                   output_dir, 
                   output_name='generated_audio',
                   steps=25, 
                   guidance_scale=3.5, 
                   batch_size=1, 
-                  duration=5.0, 
+                  duration=5.0,
                   sample_rate=16000):
-    """Generate audio from text prompt"""
+    """Generate audio from a text prompt or a batch of prompts
+
+    Passing a list of prompts runs them through a single batched
+    generate call, so the U-Net does one forward per diffusion step for
+    the whole batch. Returns one result dict per prompt in that case.
+    """
     try:
         # Ensure output directory exists
         os.makedirs(output_dir, exist_ok=True)
-        
-        # Configure generation parameters
-        output_path = os.path.join(output_dir, f"{output_name}.wav")
-        
-        # Generate audio using AudioLDM
-        waveform = model.generate(
-            text=prompt,
-            guidance_scale=guidance_scale,
-            num_inference_steps=steps,
-            duration=duration,
-            num_waveforms_per_prompt=batch_size
-        )
-        
-        # Save audio to file
-        sf.write(output_path, waveform[0], sample_rate)
-        
-        return {
-            "path": output_path,
-            "sample_rate": sample_rate,
-            "duration": duration
+
+        # Normalize to prompt/name lists so single and batched calls
+        # share one code path
+        prompts = prompt if isinstance(prompt, list) else [prompt]
+        if isinstance(output_name, list):
+            names = output_name
+        elif len(prompts) > 1:
+            names = [f"{output_name}_{i}" for i in range(len(prompts))]
+        else:
+            names = [output_name]
+
+        # Generate audio using AudioLDM; inference_mode skips autograd
+        # bookkeeping entirely and BF16 autocast gets tensor-core
+        # throughput without FP16 overflow risk
+        gen_kwargs = {
+            "guidance_scale": guidance_scale,
+            "num_inference_steps": steps,
+            "duration": duration,
+            "num_waveforms_per_prompt": 1 if len(prompts) > 1 else batch_size
         }
-        
+
+        # Reuse a cached text embedding for repeated single prompts so
+        # the T5 encoder forward is skipped on a hit
+        prompt_embeds = None
+        if len(prompts) == 1:
+            prompt_embeds = get_text_embedding(model, prompts[0])
+
+        with torch.inference_mode(), fp8_context(), torch.autocast(
+            device_type='cuda',
+            dtype=torch.bfloat16,
+            enabled=torch.cuda.is_available()
+        ):
+            if prompt_embeds is not None:
+                waveform = model.generate(prompt_embeds=prompt_embeds, **gen_kwargs)
+            else:
+                waveform = model.generate(
+                    text=prompts if len(prompts) > 1 else prompts[0],
+                    **gen_kwargs
+                )
+
+        # Save each waveform to its own file
+        results = []
+        for i, name in enumerate(names):
+            output_path = os.path.join(output_dir, f"{name}.wav")
+            sf.write(output_path, to_pcm16(waveform[i]), sample_rate, subtype='PCM_16')
+            results.append({
+                "path": output_path,
+                "sample_rate": sample_rate,
+                "duration": duration
+            })
+
+        if isinstance(prompt, list):
+            return results
+        return results[0]
+
     except Exception as e:
         return {"error": str(e)}
 
 def read_audio_file(file_path):
     """Read audio file and return encoded data for passing back to Node"""
     try:
-        audio, sample_rate = sf.read(file_path)
-        
+        # Decode directly to float32, avoiding soundfile's float64 default
+        # and the extra astype pass it would force
+        audio, sample_rate = sf.read(file_path, dtype='float32', always_2d=False)
+
         # Convert to mono if stereo
         if len(audio.shape) > 1 and audio.shape[1] > 1:
-            audio = np.mean(audio, axis=1)
-        
-        # Convert to float32
-        audio = audio.astype(np.float32)
-        
+            if audio.shape[1] == 2:
+                # Downmix in place: a vectorized add plus scale into the
+                # left channel, with no out-of-place mean allocation
+                np.add(audio[:, 0], audio[:, 1], out=audio[:, 0])
+                audio = audio[:, 0]
+                audio *= 0.5
+            else:
+                audio = np.mean(audio, axis=1, dtype=np.float32)
+
         # Calculate duration
         duration = len(audio) / sample_rate
-        
-        # Convert to base64 for JSON transfer
-        buffer = BytesIO()
-        np.save(buffer, audio)
-        encoded = base64.b64encode(buffer.getvalue()).decode('utf-8')
-        
+
+        # Encode the raw little-endian float32 samples for JSON transfer;
+        # no npy header, so Node can read it straight into a Float32Array
+        raw = audio.astype('<f4', copy=False).tobytes()
+        encoded = base64.b64encode(raw).decode('utf-8')
+
         return {
             "audio_data": encoded,
+            "format": "f32le",
+            "nbytes": len(raw),
             "sample_rate": sample_rate,
             "duration": duration
         }
@@ -140,64 +438,231 @@ def test_environment():
     except Exception as e:
         return {"error": str(e)}
 
+def handle_request(operation, params):
+    """Dispatch a single operation with its parameters"""
+    if operation == 'test-env':
+        return test_environment()
+
+    elif operation == 'load-model':
+        get_model(
+            params.get('model_path', 'latent-diffusion/audioldm-s-full'),
+            params.get('quantization', 'nf4'),
+            params.get('use_half_precision', True)
+        )
+        return {"status": "Model loaded successfully"}
+
+    elif operation == 'generate':
+        model = get_model(
+            params.get('model_path', 'latent-diffusion/audioldm-s-full'),
+            params.get('quantization', 'nf4'),
+            params.get('use_half_precision', True)
+        )
+        return generate_audio(
+            model,
+            params.get('prompt', ''),
+            params.get('output_dir', './output'),
+            params.get('output_name', 'audio'),
+            params.get('steps', 25),
+            params.get('guidance_scale', 3.5),
+            params.get('batch_size', 1),
+            params.get('duration', 5.0),
+            params.get('sample_rate', 16000)
+        )
+
+    elif operation == 'read-audio':
+        return read_audio_file(params.get('file_path', ''))
+
+    else:
+        return {"error": f"Unknown operation: {operation}"}
+
+def batchable_key(request):
+    """Generation settings that must match for requests to share a batch"""
+    params = request.get('params', {})
+    return (
+        params.get('model_path', 'latent-diffusion/audioldm-s-full'),
+        params.get('quantization', 'nf4'),
+        params.get('use_half_precision', True),
+        params.get('output_dir', './output'),
+        params.get('steps', 25),
+        params.get('guidance_scale', 3.5),
+        params.get('duration', 5.0),
+        params.get('sample_rate', 16000)
+    )
+
+def handle_generate_batch(batch, respond):
+    """Run a group of compatible generate requests as one batched call"""
+    params = batch[0].get('params', {})
+    try:
+        model = get_model(
+            params.get('model_path', 'latent-diffusion/audioldm-s-full'),
+            params.get('quantization', 'nf4'),
+            params.get('use_half_precision', True)
+        )
+        prompts = [r.get('params', {}).get('prompt', '') for r in batch]
+        names = [r.get('params', {}).get('output_name', 'audio') for r in batch]
+        results = generate_audio(
+            model,
+            prompts if len(batch) > 1 else prompts[0],
+            params.get('output_dir', './output'),
+            names if len(batch) > 1 else names[0],
+            params.get('steps', 25),
+            params.get('guidance_scale', 3.5),
+            params.get('batch_size', 1),
+            params.get('duration', 5.0),
+            params.get('sample_rate', 16000)
+        )
+    except Exception as e:
+        results = {"error": str(e)}
+
+    # A dict here means a shared failure; report it to every request
+    if not isinstance(results, list):
+        results = [dict(results) for _ in batch]
+
+    for request, result in zip(batch, results):
+        respond(result, request.get('request_id'))
+
+def serve():
+    """Run as a persistent server reading newline-delimited JSON from stdin
+
+    The model is loaded once (on the first request that needs it) and stays
+    resident, so repeated generate calls skip the model load entirely.
+    Queued generate requests with matching settings are micro-batched into
+    a single diffusion pass.
+    """
+    print(json_dumps({"status": "ready"}), flush=True)
+
+    # A reader thread feeds parsed requests into a queue so the main loop
+    # can wait with a timeout while collecting a batch
+    requests = queue.Queue()
+
+    def reader():
+        for line in sys.stdin:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                request = json_loads(line)
+                # Valid JSON that isn't an object would blow up the
+                # dispatch loop's .get calls; treat it as a parse error
+                if not isinstance(request, dict):
+                    raise ValueError(
+                        f"Request must be a JSON object, got {type(request).__name__}"
+                    )
+                requests.put(request)
+            except Exception as e:
+                requests.put({"_parse_error": str(e)})
+        requests.put(None)  # EOF sentinel
+
+    threading.Thread(target=reader, daemon=True).start()
+
+    pending = []
+    eof = False
+
+    def respond(result, request_id):
+        result['request_id'] = request_id
+        print(json_dumps(result), flush=True)
+
+    def next_request(timeout=None):
+        """Return the next request; None on timeout or exhausted input"""
+        nonlocal eof
+        if pending:
+            return pending.pop(0)
+        if eof:
+            return None
+        try:
+            item = requests.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        if item is None:
+            eof = True
+            return None
+        return item
+
+    while True:
+        request = next_request()
+        if request is None:
+            break
+
+        if '_parse_error' in request:
+            respond({"error": request['_parse_error']}, None)
+            continue
+
+        if request.get('operation') != 'generate':
+            try:
+                result = handle_request(request.get('operation'), request.get('params', {}))
+            except Exception as e:
+                result = {"error": str(e)}
+            respond(result, request.get('request_id'))
+            continue
+
+        # Micro-batch: wait up to BATCH_WINDOW for more generate requests
+        # with compatible settings so they share one diffusion pass
+        batch = [request]
+        key = batchable_key(request)
+        # Track output names already claimed by this batch: a duplicate
+        # would make the save loop write the same path twice, with the
+        # second waveform overwriting the first before callers read it
+        batch_names = {request.get('params', {}).get('output_name', 'audio')}
+        deadline = time.time() + BATCH_WINDOW
+        while len(batch) < MAX_BATCH:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            queued = next_request(timeout=remaining)
+            if queued is None:
+                break
+            queued_name = None
+            if '_parse_error' not in queued:
+                queued_name = queued.get('params', {}).get('output_name', 'audio')
+            if (
+                '_parse_error' not in queued
+                and queued.get('operation') == 'generate'
+                and batchable_key(queued) == key
+                and queued_name not in batch_names
+            ):
+                batch.append(queued)
+                batch_names.add(queued_name)
+            else:
+                # Incompatible request: handle it after this batch
+                pending.append(queued)
+                break
+
+        handle_generate_batch(batch, respond)
+
 def main():
-    parser = argparse.ArgumentParser(description='AudioLDM Operations')
-    parser.add_argument('--operation', required=True, 
-                       choices=['test-env', 'load-model', 'generate', 'read-audio'])
-    parser.add_argument('--request-id', required=True, help='Request ID')
-    parser.add_argument('--params', required=True, help='Parameters as JSON string')
-    
-    args = parser.parse_args()
-    params = json.loads(args.params)
-    
+    args = parse_args(sys.argv[1:])
+    operation = args.get('operation')
+    request_id = args.get('request-id')
+
+    if operation not in ('test-env', 'load-model', 'generate', 'read-audio', 'serve'):
+        print(json_dumps({
+            'error': f"Unknown operation: {operation}",
+            'request_id': request_id
+        }))
+        sys.exit(2)
+
+    # Persistent server mode: handle requests from stdin until EOF
+    if operation == 'serve':
+        serve()
+        return
+
+    params = json_loads(args.get('params', '{}'))
+
     try:
-        result = {}
-        
-        # Execute requested operation
-        if args.operation == 'test-env':
-            result = test_environment()
-            
-        elif args.operation == 'load-model':
-            model = load_model(
-                params.get('model_path', 'latent-diffusion/audioldm-s-full'),
-                params.get('quantization', '8bit'),
-                params.get('use_half_precision', True)
-            )
-            result = {"status": "Model loaded successfully"}
-            
-        elif args.operation == 'generate':
-            model = load_model(
-                params.get('model_path', 'latent-diffusion/audioldm-s-full'),
-                params.get('quantization', '8bit'),
-                params.get('use_half_precision', True)
-            )
-            result = generate_audio(
-                model,
-                params.get('prompt', ''),
-                params.get('output_dir', './output'),
-                params.get('output_name', 'audio'),
-                params.get('steps', 25),
-                params.get('guidance_scale', 3.5),
-                params.get('batch_size', 1),
-                params.get('duration', 5.0),
-                params.get('sample_rate', 16000)
-            )
-            
-        elif args.operation == 'read-audio':
-            result = read_audio_file(params.get('file_path', ''))
-            
+        result = handle_request(operation, params)
+
         # Add request ID to result
-        result['request_id'] = args.request_id
-        
+        result['request_id'] = request_id
+
         # Print result as JSON
-        print(json.dumps(result))
-        
+        print(json_dumps(result))
+
     except Exception as e:
         error = {
             'error': str(e),
-            'request_id': args.request_id
+            'request_id': request_id
         }
-        print(json.dumps(error))
+        print(json_dumps(error))
         sys.exit(1)
 
 if __name__ == '__main__':
@@ -1,98 +1,397 @@
-import argparse
 import json
 import sys
 import torch
 from transformers import Wav2Vec2ForCTC, Wav2Vec2Processor
 import soundfile as sf
+from contextlib import contextmanager
+
+# TF32 matmul and autotuned cuDNN conv algorithms: large FP32 matmul
+# speedups on Ampere+ at negligible accuracy cost, and benchmark mode
+# picks the best conv kernels for the stable shapes a request stream
+# produces under the persistent server
+if torch.cuda.is_available():
+    torch.backends.cuda.matmul.allow_tf32 = True
+    torch.backends.cudnn.allow_tf32 = True
+    torch.backends.cudnn.benchmark = True
+    torch.set_float32_matmul_precision('high')
+
+# orjson parses and serializes 2-3x faster than the stdlib json; fall
+# back transparently when it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def json_loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def json_dumps(obj):
+    if orjson is not None:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj)
+
+def parse_args(argv):
+    """Minimal --flag value parser; argparse construction is ~5 ms of
+    overhead per fork, which matters for one-shot CLI invocations"""
+    args = {}
+    i = 0
+    while i < len(argv) - 1:
+        if argv[i].startswith('--'):
+            args[argv[i][2:]] = argv[i + 1]
+            i += 2
+        else:
+            i += 1
+    return args
+
+# Module-level model state so a persistent server only loads once
+MODEL = None
+PROCESSOR = None
+
+# Fixed input shape used for CUDA-graph replay (10 s @ 16 kHz)
+CHUNK = 160000
+
+# Pinned host staging buffer sized for the longest expected clip
+# (30 s @ 16 kHz); allocated lazily since pinning needs a CUDA runtime
+MAX_SAMPLES = 480000
+STAGE = None
+
+def pinned_stage(tensor):
+    """Copy a (1, N) float32 CPU tensor into the pinned staging buffer
+
+    Transfers from page-locked memory can run asynchronously and overlap
+    with subsequent kernel launches, unlike pageable copies. Returns None
+    when the tensor does not fit the buffer layout.
+    """
+    global STAGE
+    if (
+        tensor.dtype != torch.float32
+        or tensor.dim() != 2
+        or tensor.shape[0] != 1
+        or tensor.shape[1] > MAX_SAMPLES
+    ):
+        return None
+    if STAGE is None:
+        STAGE = torch.empty(1, MAX_SAMPLES, dtype=torch.float32, pin_memory=True)
+    staged = STAGE[:, :tensor.shape[1]]
+    staged.copy_(tensor)
+    return staged
+
+# Reusable argmax output sized for the longest clip (wav2vec2 emits
+# roughly one frame per 320 samples); reusing it keeps the caching
+# allocator from churning alloc/free cycles in a long-running server
+PRED_IDS = None
+
+def argmax_ids(logits):
+    """Argmax over the vocab dim into a reused buffer when on GPU"""
+    global PRED_IDS
+    if not logits.is_cuda:
+        return torch.argmax(logits, dim=-1)
+    if PRED_IDS is None or PRED_IDS.shape[1] < logits.shape[1]:
+        max_frames = max(MAX_SAMPLES // 320, logits.shape[1])
+        PRED_IDS = torch.empty(1, max_frames, dtype=torch.long, device='cuda')
+    out = PRED_IDS[:, :logits.shape[1]]
+    torch.argmax(logits, dim=-1, out=out)
+    return out
+
+def to_device(tensor):
+    """Move an input tensor to the GPU, staging through pinned memory"""
+    if not torch.cuda.is_available():
+        return tensor
+    staged = pinned_stage(tensor)
+    if staged is not None:
+        return staged.to('cuda', non_blocking=True)
+    return tensor.to('cuda')
+
+# Lazily-captured CUDA graph state for process_audio
+GRAPH = None
+GRAPH_INPUT = None
+GRAPH_LOGITS = None
+GRAPH_FAILED = False
+
+def ensure_cuda_graph(model):
+    """Capture the CTC forward into a CUDA graph on first use
+
+    Replaying a captured graph skips the per-kernel launch overhead that
+    dominates short-utterance latency. Replay requires the fixed CHUNK
+    input shape; any capture failure disables graphs for this process
+    and inference falls back to the regular path.
+    """
+    global GRAPH, GRAPH_INPUT, GRAPH_LOGITS, GRAPH_FAILED
+    if GRAPH is not None or GRAPH_FAILED or not torch.cuda.is_available():
+        return
+    try:
+        # Capture against the eager module: reduce-overhead compiled
+        # wrappers manage their own graphs and cannot be re-captured
+        eager = getattr(model, '_orig_mod', model)
+        dtype = next(eager.parameters()).dtype
+        static_in = torch.zeros(1, CHUNK, dtype=dtype, device='cuda')
+
+        # Warm up on a side stream, as required before graph capture
+        stream = torch.cuda.Stream()
+        stream.wait_stream(torch.cuda.current_stream())
+        with torch.cuda.stream(stream), torch.inference_mode():
+            eager(input_values=static_in)
+        torch.cuda.current_stream().wait_stream(stream)
+
+        graph = torch.cuda.CUDAGraph()
+        with torch.cuda.graph(graph), torch.inference_mode():
+            static_out = eager(input_values=static_in).logits
+
+        GRAPH, GRAPH_INPUT, GRAPH_LOGITS = graph, static_in, static_out
+    except Exception:
+        GRAPH_FAILED = True
+
+@contextmanager
+def inference_context():
+    """Inference mode plus BF16 autocast for every model forward
+
+    inference_mode is strictly faster than no_grad (no version-counter or
+    view bookkeeping), and BF16 autocast gets tensor-core throughput on
+    Ampere+ without FP16's overflow risk.
+    """
+    with torch.inference_mode(), torch.autocast(
+        device_type='cuda',
+        dtype=torch.bfloat16,
+        enabled=torch.cuda.is_available()
+    ):
+        yield
+
+def prepare_input_values(audio, processor):
+    """Build normalized input_values on the GPU, bypassing the processor
+
+    The wav2vec2 feature extractor only does zero-mean/unit-variance
+    normalization and padding, in numpy on the CPU. Doing the same math
+    on the device removes a full O(N) host-side pass and transfers the
+    raw samples exactly once. Returns None (caller falls back to the
+    processor) on CPU-only hosts or non-mono input.
+    """
+    if not torch.cuda.is_available() or audio.ndim != 1:
+        return None
+
+    x = torch.from_numpy(audio).unsqueeze(0)
+    staged = pinned_stage(x)
+    if staged is not None:
+        x = staged.to('cuda', non_blocking=True)
+    else:
+        x = x.to('cuda')
+
+    extractor = getattr(processor, 'feature_extractor', None)
+    if extractor is None or getattr(extractor, 'do_normalize', True):
+        x = (x - x.mean()) / torch.sqrt(x.var() + 1e-7)
+
+    return x
 
 def load_model(model_name="facebook/wav2vec2-base-960h"):
     """Load wav2vec2 model and processor"""
     processor = Wav2Vec2Processor.from_pretrained(model_name)
-    model = Wav2Vec2ForCTC.from_pretrained(model_name)
-    
+
+    # Route encoder self-attention through the fused SDPA kernel, which
+    # tiles the softmax matrix FlashAttention-style and cuts the memory
+    # traffic that dominates attention on long clips. On GPU, stream the
+    # safetensors shards straight to the device (low_cpu_mem_usage +
+    # device_map) instead of materializing a full CPU copy and moving it
     if torch.cuda.is_available():
-        model = model.to("cuda")
-    
+        try:
+            model = Wav2Vec2ForCTC.from_pretrained(
+                model_name,
+                attn_implementation='sdpa',
+                torch_dtype=torch.bfloat16,
+                low_cpu_mem_usage=True,
+                device_map='cuda'
+            )
+        except (TypeError, ValueError, ImportError):
+            # Older transformers, or no accelerate for device_map
+            model = Wav2Vec2ForCTC.from_pretrained(model_name).to('cuda')
+    else:
+        try:
+            model = Wav2Vec2ForCTC.from_pretrained(
+                model_name,
+                attn_implementation='sdpa'
+            )
+        except (TypeError, ValueError):
+            model = Wav2Vec2ForCTC.from_pretrained(model_name)
+
+    # Inference-only: freeze parameters so autograd bookkeeping is
+    # skipped even outside inference_mode regions
+    model.eval()
+    model.requires_grad_(False)
+
+    # Compile the forward pass; reduce-overhead mode uses CUDA graphs to
+    # cut per-kernel launch latency, which dominates short-clip inference
+    if hasattr(torch, 'compile'):
+        model = torch.compile(model, mode='reduce-overhead')
+
+        # Warm up with a dummy second of audio so compilation and graph
+        # capture happen at load time instead of on the first request
+        if torch.cuda.is_available():
+            dummy = torch.zeros(1, 16000, device='cuda')
+            with inference_context():
+                model(input_values=dummy)
+
     return model, processor
 
+def get_model(model_name="facebook/wav2vec2-base-960h"):
+    """Return the resident model/processor, loading them on first use"""
+    global MODEL, PROCESSOR
+    if MODEL is None:
+        MODEL, PROCESSOR = load_model(model_name)
+    return MODEL, PROCESSOR
+
 def process_audio(audio_path, model, processor):
     """Process audio using wav2vec2"""
-    # Load audio
-    audio, sample_rate = sf.read(audio_path)
-    
-    # Process audio
-    inputs = processor(audio, sampling_rate=sample_rate, return_tensors="pt")
-    
-    if torch.cuda.is_available():
-        inputs = {key: val.to("cuda") for key, val in inputs.items()}
-    
-    with torch.no_grad():
-        logits = model(**inputs).logits
-    
-    # Decode
-    predicted_ids = torch.argmax(logits, dim=-1)
+    # Load audio directly as float32 (soundfile defaults to float64)
+    audio, sample_rate = sf.read(audio_path, dtype='float32', always_2d=False)
+
+    ensure_cuda_graph(model)
+
+    input_values = prepare_input_values(audio, processor)
+
+    # Clips longer than the captured CHUNK shape take the regular
+    # forward path; truncating them to fit the graph would silently
+    # transcribe only the first 10 seconds
+    if GRAPH is not None and input_values is not None and len(audio) <= CHUNK:
+        # Graph replay path: normalize on device, zero-pad into the
+        # captured CHUNK shape and replay the recorded kernels
+        GRAPH_INPUT.zero_()
+        GRAPH_INPUT[:, :input_values.shape[1]].copy_(input_values)
+        GRAPH.replay()
+        logits = GRAPH_LOGITS
+    elif input_values is not None:
+        with inference_context():
+            logits = model(input_values=input_values).logits
+    else:
+        # Process audio
+        inputs = processor(audio, sampling_rate=sample_rate, return_tensors="pt")
+
+        if torch.cuda.is_available():
+            inputs = {key: to_device(val) for key, val in inputs.items()}
+
+        with inference_context():
+            logits = model(**inputs).logits
+
+    # Decode; start the device-to-host copy early so it can overlap with
+    # decode preparation
+    predicted_ids = argmax_ids(logits)
+    if predicted_ids.is_cuda:
+        predicted_ids = predicted_ids.to('cpu', non_blocking=True)
     transcription = processor.batch_decode(predicted_ids)
     
     return {
         "transcription": transcription[0],
-        "confidence": float(torch.max(logits).cpu().numpy())
+        "confidence": torch.max(logits).item()
     }
 
 def analyze_audio(audio_path, model, processor):
     """Extract features from audio using wav2vec2"""
-    # Load audio
-    audio, sample_rate = sf.read(audio_path)
-    
-    # Process audio to get features
-    inputs = processor(audio, sampling_rate=sample_rate, return_tensors="pt")
+    # Load audio directly as float32 (soundfile defaults to float64)
+    audio, sample_rate = sf.read(audio_path, dtype='float32', always_2d=False)
     
-    if torch.cuda.is_available():
-        inputs = {key: val.to("cuda") for key, val in inputs.items()}
-    
-    with torch.no_grad():
-        outputs = model(**inputs, output_hidden_states=True)
+    # Process audio to get features, normalizing on the GPU when possible
+    input_values = prepare_input_values(audio, processor)
+    if input_values is not None:
+        with inference_context():
+            outputs = model(input_values=input_values, output_hidden_states=True)
+    else:
+        inputs = processor(audio, sampling_rate=sample_rate, return_tensors="pt")
+
+        if torch.cuda.is_available():
+            inputs = {key: to_device(val) for key, val in inputs.items()}
+
+        with inference_context():
+            outputs = model(**inputs, output_hidden_states=True)
     
     # Get last hidden state
     features = outputs.hidden_states[-1].mean(dim=1)
-    
-    # Convert to list for JSON serialization
-    feature_list = features.cpu().numpy().tolist()[0]
-    
+
+    # Only the first 20 features are reported; slice on the GPU so just
+    # those values cross to the host instead of the full vector
+    sample = features[0, :20].to('cpu', non_blocking=True).float().tolist()
+
     return {
-        "features": feature_list[:20],  # Return first 20 features as sample
-        "feature_count": len(feature_list)
+        "features": sample,  # Return first 20 features as sample
+        "feature_count": int(features.shape[-1])
     }
 
+def handle_request(request):
+    """Dispatch a single request to the appropriate operation"""
+    model, processor = get_model()
+    operation = request.get('operation')
+    audio_path = request.get('audio')
+
+    if operation == 'process':
+        return process_audio(audio_path, model, processor)
+    elif operation == 'analyze':
+        return analyze_audio(audio_path, model, processor)
+    else:
+        return {"error": f"Unknown operation: {operation}"}
+
+def serve():
+    """Run as a persistent server reading newline-delimited JSON from stdin
+
+    The model is loaded once and stays resident, so each request only pays
+    for inference instead of a full model load.
+    """
+    # Load model up front so the ready signal means requests are cheap
+    get_model()
+    print(json_dumps({"status": "ready"}), flush=True)
+
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+
+        request_id = None
+        try:
+            request = json_loads(line)
+            request_id = request.get('request_id')
+            result = handle_request(request)
+        except Exception as e:
+            result = {"error": str(e)}
+
+        result['request_id'] = request_id
+        print(json_dumps(result), flush=True)
+
 def main():
-    parser = argparse.ArgumentParser(description='Wav2Vec2 Operations')
-    parser.add_argument('--operation', required=True, choices=['process', 'analyze'])
-    parser.add_argument('--audio', required=True, help='Path to audio file')
-    parser.add_argument('--request-id', required=True, help='Request ID')
-    
-    args = parser.parse_args()
-    
+    args = parse_args(sys.argv[1:])
+    operation = args.get('operation')
+    request_id = args.get('request-id')
+
+    if operation not in ('process', 'analyze', 'serve'):
+        print(json_dumps({
+            'error': f"Unknown operation: {operation}",
+            'request_id': request_id
+        }))
+        sys.exit(2)
+
+    # Persistent server mode: handle requests from stdin until EOF
+    if operation == 'serve':
+        serve()
+        return
+
     try:
         # Load model
-        model, processor = load_model()
-        
+        model, processor = get_model()
+
         # Perform operation
-        if args.operation == 'process':
-            result = process_audio(args.audio, model, processor)
+        if operation == 'process':
+            result = process_audio(args.get('audio'), model, processor)
         else:  # analyze
-            result = analyze_audio(args.audio, model, processor)
-        
+            result = analyze_audio(args.get('audio'), model, processor)
+
         # Add request ID to result
-        result['request_id'] = args.request_id
-        
+        result['request_id'] = request_id
+
         # Return result as JSON
-        print(json.dumps(result))
-        
+        print(json_dumps(result))
+
     except Exception as e:
         error = {
             'error': str(e),
-            'request_id': args.request_id
+            'request_id': request_id
         }
-        print(json.dumps(error))
+        print(json_dumps(error))
         sys.exit(1)
 
 if __name__ == '__main__':
@@ -21,10 +21,19 @@ export class PythonBridgeError extends Error {
   }
 }
 
+interface PendingRequest {
+  resolve: (result: any) => void;
+  reject: (error: Error) => void;
+}
+
 export class PythonBridge {
   private pythonPath: string;
   private scriptPath: string;
   private timeout: number;
+  private serverProcess: ChildProcess | null;
+  private serverReady: Promise<void> | null;
+  private pendingRequests: Map<string, PendingRequest>;
+  private stdoutBuffer: string;
   private activeProcesses: Set<ChildProcess>;
   private isDisposed: boolean;
 
@@ -34,6 +43,10 @@ export class PythonBridge {
       options.scriptPath ||
       path.join(__dirname, "../../scripts/wav2vec2_operations.py");
     this.timeout = options.timeout || 30000; // 30 seconds default timeout
+    this.serverProcess = null;
+    this.serverReady = null;
+    this.pendingRequests = new Map();
+    this.stdoutBuffer = "";
     this.activeProcesses = new Set();
     this.isDisposed = false;
   }
@@ -75,7 +88,8 @@ export class PythonBridge {
       }
 
       const result = await this.executeWithTimeout(
-        this.spawnPythonProcess(operation, audioPath, requestId)
+        this.sendRequest(operation, audioPath, requestId),
+        requestId
       );
 
       return result;
@@ -92,13 +106,21 @@ export class PythonBridge {
   }
 
   /**
-   * Execute a promise with timeout
+   * Execute a promise with timeout, dropping the pending request entry
+   * when the timer fires so timed-out requests don't accumulate in the
+   * map (and a late server response finds nothing to resolve)
    */
-  private executeWithTimeout<T>(promise: Promise<T>): Promise<T> {
+  private executeWithTimeout<T>(
+    promise: Promise<T>,
+    requestId?: string
+  ): Promise<T> {
     return Promise.race([
       promise,
       new Promise<T>((_, reject) => {
         setTimeout(() => {
+          if (requestId) {
+            this.pendingRequests.delete(requestId);
+          }
           reject(new Error(`Operation timed out after ${this.timeout}ms`));
         }, this.timeout);
       }),
@@ -106,82 +128,164 @@ export class PythonBridge {
   }
 
   /**
-   * Spawn Python process and handle communication
+   * Start the persistent Python server if it is not already running.
+   * The server keeps the model resident, so per-request cost is inference
+   * only rather than a full model load.
    */
-  private spawnPythonProcess(
-    operation: string,
-    audioPath: string,
-    requestId: string
-  ): Promise<any> {
-    return new Promise((resolve, reject) => {
-      const pythonProcess = spawn(this.pythonPath, [
-        this.scriptPath,
-        "--operation",
-        operation,
-        "--audio",
-        audioPath,
-        "--request-id",
-        requestId,
-      ]);
+  private ensureServer(): Promise<void> {
+    if (this.serverProcess && this.serverReady) {
+      return this.serverReady;
+    }
 
-      // Track the process
-      this.activeProcesses.add(pythonProcess);
+    const serverProcess = spawn(this.pythonPath, [
+      this.scriptPath,
+      "--operation",
+      "serve",
+    ]);
+
+    this.serverProcess = serverProcess;
+    this.stdoutBuffer = "";
 
-      let result = "";
+    this.serverReady = new Promise((resolve, reject) => {
       let errorOutput = "";
+      let ready = false;
 
-      pythonProcess.stdout.on("data", (data) => {
-        result += data.toString();
+      serverProcess.stdout.on("data", (data) => {
+        this.stdoutBuffer += data.toString();
+
+        // Responses are newline-delimited JSON
+        let newlineIndex = this.stdoutBuffer.indexOf("\n");
+        while (newlineIndex !== -1) {
+          const line = this.stdoutBuffer.slice(0, newlineIndex).trim();
+          this.stdoutBuffer = this.stdoutBuffer.slice(newlineIndex + 1);
+
+          if (line) {
+            if (!ready) {
+              // First line is the server's ready signal
+              ready = true;
+              resolve();
+            } else {
+              this.handleResponseLine(line);
+            }
+          }
+
+          newlineIndex = this.stdoutBuffer.indexOf("\n");
+        }
       });
 
-      pythonProcess.stderr.on("data", (data) => {
+      serverProcess.stderr.on("data", (data) => {
         errorOutput += data.toString();
       });
 
-      pythonProcess.on("error", (error: Error) => {
-        this.activeProcesses.delete(pythonProcess);
+      serverProcess.on("error", (error: Error) => {
+        this.resetServer(
+          new PythonBridgeError(
+            `Failed to spawn Python process: ${error.message}`,
+            uuidv4()
+          )
+        );
         reject(
           new PythonBridgeError(
             `Failed to spawn Python process: ${error.message}`,
-            requestId
+            uuidv4()
           )
         );
       });
 
-      pythonProcess.on("close", (code: number | null) => {
-        this.activeProcesses.delete(pythonProcess);
-
-        if (code !== 0) {
-          reject(
-            new PythonBridgeError(
-              `Python process exited with code ${
-                code || "unknown"
-              }: ${errorOutput}`,
-              requestId,
-              code || undefined
-            )
-          );
-          return;
+      serverProcess.on("close", (code: number | null) => {
+        const error = new PythonBridgeError(
+          `Python process exited with code ${code || "unknown"}: ${errorOutput}`,
+          uuidv4(),
+          code || undefined
+        );
+        this.resetServer(error);
+        if (!ready) {
+          reject(error);
         }
+      });
+    });
 
-        try {
-          const parsedResult = JSON.parse(result);
-
-          // Check if Python script returned an error
-          if (parsedResult.error) {
-            reject(
-              new PythonBridgeError(parsedResult.error, parsedResult.request_id)
-            );
-            return;
-          }
+    return this.serverReady;
+  }
 
-          resolve(parsedResult);
-        } catch (error) {
+  /**
+   * Match a response line from the server to its pending request
+   */
+  private handleResponseLine(line: string): void {
+    let parsed: any;
+    try {
+      parsed = JSON.parse(line);
+    } catch (error) {
+      // Not valid JSON; nothing we can route this to
+      console.error("Failed to parse Python response:", line);
+      return;
+    }
+
+    const pending = this.pendingRequests.get(parsed.request_id);
+    if (!pending) {
+      return;
+    }
+
+    this.pendingRequests.delete(parsed.request_id);
+
+    if (parsed.error) {
+      pending.reject(new PythonBridgeError(parsed.error, parsed.request_id));
+    } else {
+      pending.resolve(parsed);
+    }
+  }
+
+  /**
+   * Tear down the server and fail any in-flight requests
+   */
+  private resetServer(error: Error): void {
+    this.serverProcess = null;
+    this.serverReady = null;
+
+    for (const [requestId, pending] of this.pendingRequests) {
+      pending.reject(
+        new PythonBridgeError(
+          `Python server terminated: ${error.message}`,
+          requestId
+        )
+      );
+    }
+    this.pendingRequests.clear();
+  }
+
+  /**
+   * Send a request line to the persistent server and await its response
+   */
+  private async sendRequest(
+    operation: string,
+    audioPath: string,
+    requestId: string
+  ): Promise<any> {
+    await this.ensureServer();
+
+    return new Promise((resolve, reject) => {
+      if (!this.serverProcess || !this.serverProcess.stdin) {
+        reject(
+          new PythonBridgeError("Python server is not running", requestId)
+        );
+        return;
+      }
+
+      this.pendingRequests.set(requestId, { resolve, reject });
+
+      const request =
+        JSON.stringify({
+          request_id: requestId,
+          operation,
+          audio: audioPath,
+        }) + "\n";
+
+      this.serverProcess.stdin.write(request, (error) => {
+        if (error) {
+          this.pendingRequests.delete(requestId);
           reject(
             new PythonBridgeError(
-              `Failed to parse result: ${
-                error instanceof Error ? error.message : "Unknown error"
-              }`,
+              `Failed to write request: ${error.message}`,
               requestId
             )
           );
@@ -228,7 +332,27 @@ export class PythonBridge {
 
     this.isDisposed = true;
 
-    // Terminate all active processes
+    // Shut down the persistent server
+    if (this.serverProcess) {
+      if (this.serverProcess.stdin) {
+        this.serverProcess.stdin.end();
+      }
+      if (!this.serverProcess.killed) {
+        this.serverProcess.kill();
+      }
+      this.serverProcess = null;
+      this.serverReady = null;
+    }
+
+    // Fail any in-flight requests
+    for (const [requestId, pending] of this.pendingRequests) {
+      pending.reject(
+        new PythonBridgeError("Bridge has been disposed", requestId)
+      );
+    }
+    this.pendingRequests.clear();
+
+    // Terminate all other tracked processes
     for (const process of this.activeProcesses) {
       if (!process.killed) {
         process.kill();